@@ -10,6 +10,15 @@ DICT =   "data/ngsl.csv"           # Pretty good for more common words
 # DICT = "data/nifty-3.txt"            # From Stuart Reges' entry in Nifty Projects database
 # DICT = "data/cs_sample.txt"            # Tiny list for test cases
 
+# The search remembers the anagram completions it has found for a given
+# set of remaining letters, so it does not have to repeat that search
+# when another ordering of words leaves the same letters.  Sets of letters
+# with more completions than MEMO_MAX_COMPLETIONS are not remembered, and
+# once MEMO_MAX_ENTRIES sets of letters are remembered no more are added.
+# Together these bound the memory the search uses (each entry takes a
+# few hundred bytes, plus its completions).
+MEMO_MAX_COMPLETIONS = 200
+MEMO_MAX_ENTRIES = 100_000
 
 # Some large word lists contain "words" that are almost never useful,
 # especially very short words that can dominate the list.  Rather than
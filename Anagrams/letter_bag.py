@@ -4,36 +4,104 @@ in the bag.
 Credit: GE Liam, Jocelyn Guan, GE Nhi
 """
 
-def normalize(phrase: str) -> list[str]:
+import array
+
+# Letter counts are stored packed into one big int, one byte
+# per letter of the alphabet ('a' in the low byte, 'z' in the
+# high byte), so that a whole bag can be compared or subtracted
+# with a single integer operation.  The per-letter counts of
+# LetterBag.counts are a view unpacked from that int on demand.
+N_LETTERS = 26
+ORD_A = ord('a')
+
+# Each count is at most 127, leaving the high bit of every byte
+# free as a guard: if we set all the guards before subtracting,
+# a letter that runs short borrows from its own guard bit instead
+# of from its neighbor, and that guard bit comes out clear.
+GUARDS = int.from_bytes(b'\x80' * N_LETTERS, 'little')
+MAX_COUNT = 0x7f
+
+# Bytes that are not lower case letters, for normalize to delete
+_NOT_LETTERS = bytes(b for b in range(256)
+                     if not ORD_A <= b < ORD_A + N_LETTERS)
+
+# What each byte adds to a packed count: 1 in its own letter's
+# byte for a lower case letter, nothing for anything else.
+_LETTER_WEIGHT = [1 << 8 * (b - ORD_A) if ORD_A <= b < ORD_A + N_LETTERS else 0
+                  for b in range(256)]
+
+
+def countable(phrase: str) -> bool:
+    """Are all the letters in phrase ones a LetterBag
+    can count, i.e., a-z in either case?  (A word with
+    other letters, like "résumé", can never be matched.)
+    """
+    return phrase.isascii() or not any(ch.isalpha() and not ch.isascii()
+                                       for ch in phrase)
+
+
+def _check_countable(phrase: str) -> None:
+    if not countable(phrase):
+        raise ValueError(f"'{phrase}' has letters other than a-z")
+
+
+def normalize(phrase: str) -> str:
     """Normalize word or phrase to the
     sequence of letters we will try to match, discarding
     anything else, such as blanks and apostrophes.
-    Return as a list of individual letters.
+    Return as a string of lower case letters.
+    Raises ValueError if phrase has letters other
+    than a-z, which a LetterBag cannot count.
     """
-    new_list = []
-    for i in phrase:
-        if i.isalpha():
-            new_list.append(i.lower())   
-    return new_list
- 
+    _check_countable(phrase)
+    # All non-ascii characters are now known not to be letters
+    letters = phrase.encode("ascii", "ignore").lower()
+    return letters.translate(None, _NOT_LETTERS).decode("ascii")
+
+
+def pack(word: str) -> int:
+    """Letter counts of word, packed one byte per letter
+    (see GUARDS above).  Raises ValueError if word has
+    letters other than a-z, or too many of one letter.
+    """
+    _check_countable(word)
+    # Summing the weights of the bytes skips non-letters by itself,
+    # so we need not normalize first.
+    chars = word.encode("ascii", "ignore").lower()
+    if len(chars) > MAX_COUNT and any(chars.count(b) > MAX_COUNT
+                                      for b in range(ORD_A, ORD_A + N_LETTERS)):
+        raise ValueError(f"More than {MAX_COUNT} of a letter in '{word}'")
+    return sum(map(_LETTER_WEIGHT.__getitem__, chars))
+
+
+def fits(letters: int, need: int) -> bool:
+    """Are there enough of each letter in packed counts letters
+    to supply packed counts need?
+    """
+    return ((letters | GUARDS) - need) & GUARDS == GUARDS
+
+
 class LetterBag:
     """A bag (also known as a multiset) is
     a map from keys to non-negative integers.
     A LetterBag is a bag of single character
     strings.
     """
+    # Bags are small and made in quantity, so we skip the per-object dict
+    __slots__ = ("word", "packed", "length")
+
     def __init__(self, word=""):
-        """Create a LetterBag"""
+        """Create a LetterBag.  Raises ValueError if word
+        has letters other than a-z.
+        """
         self.word = word.strip()
-        normal = normalize(self.word)
-        self.length = len(normal)  # Counts letters only!
-        self.letters = {}
-        for i in normal:
-            if i in self.letters:
-                self.letters[i] += 1
-            else:
-                self.letters[i] = 1
-        
+        self.packed = pack(self.word)
+        self.length = sum(self.counts)  # Counts letters only!
+
+    @property
+    def counts(self) -> array.array:
+        """Count of each letter, indexed by position in alphabet"""
+        return array.array('b', self.packed.to_bytes(N_LETTERS, 'little'))
 
     def __len__(self):
         return self.length
@@ -42,26 +110,28 @@ class LetterBag:
         return self.word
 
     def __repr__(self):
-        counts = [f"{ch}:{n}" for ch, n in self.letters.items() if n > 0]
+        counts = [f"{chr(ORD_A + i)}:{n}"
+                  for i, n in enumerate(self.counts) if n > 0]
         return f'LetterBag({self.word}/[{", ".join(counts)}])'
     
     def contains(self, other: "LetterBag") -> bool:
         """Determine whether enough of each letter in
         other LetterBag are contained in this LetterBag.
         """
-        for letter in other.letters.keys():
-            if letter not in self.letters.keys():
-                return False
-            if self.letters[letter] < other.letters[letter]:
-                return False
-        return True
+        if other.length > self.length:
+            return False   # Can't possibly fit, no need to compare letters
+        # No separate check for letters we lack entirely: fits()
+        # compares all 26 counts at once, so a mask would only add work.
+        return fits(self.packed, other.packed)
 
 
     def copy(self) -> "LetterBag":
         """Make a copy before mutating."""
-        copy_ = LetterBag()
+        # Every field is set below, so bypass __init__, which would
+        # go to the trouble of counting the letters of an empty word
+        copy_ = LetterBag.__new__(LetterBag)
         copy_.word = self.word
-        copy_.letters = self.letters.copy()  # Copied to avoid aliasing
+        copy_.packed = self.packed
         copy_.length = self.length
         return copy_
     
@@ -70,11 +140,9 @@ class LetterBag:
         the letters in other.  Raises exception
         if any letters are not present.
         """
+        assert self.contains(other)
         bag = self.copy()
-
-        for key, value in other.letters.items():
-            assert key in bag.letters and bag.letters[key] >= value
-            bag.letters[key] = bag.letters[key] - value     
+        bag.packed = self.packed - other.packed
         bag.length = len(bag) - len(other)
         return bag
 
@@ -0,0 +1,191 @@
+"""Tests for LetterBag and the anagram search.
+Run from this directory:  python -m unittest test_letter_bag
+"""
+from letter_bag import *
+import anagram
+import config
+import contextlib
+import io
+import sys
+import unittest
+from unittest import mock
+
+
+def search_words(phrase: str, words: list[str], limit: int=500, seed: str="") -> list[str]:
+    """Search as anagram.main does, from a plain list of words"""
+    bag = LetterBag(phrase)
+    cand_words = [word for word in words if fits(bag.packed, pack(word))]
+    cand_packed = [pack(word) for word in cand_words]
+    return anagram.search(bag, cand_words, cand_packed, limit=limit, seed=seed)
+
+
+def brute_force(letters: LetterBag, words: list[str], pos: int=0,
+                phrase: tuple[str, ...]=()) -> list[str]:
+    """The anagrams the search should find, in the same order,
+    with no narrowing, memo, or limit.
+    """
+    found = []
+    for i in range(pos, len(words)):
+        word = LetterBag(words[i])
+        if letters.contains(word):
+            rest = letters.take(word)
+            if len(rest) == 0:
+                found.append(" ".join(phrase + (words[i],)))
+            else:
+                found.extend(brute_force(rest, words, i + 1, phrase + (words[i],)))
+    return found
+
+
+class TestLetterBag(unittest.TestCase):
+    """Packed letter counts"""
+
+    def test_counts(self):
+        bag = LetterBag("Hello, World!")
+        self.assertEqual(len(bag), 10)
+        self.assertEqual(bag.counts[ord('l') - ORD_A], 3)
+        self.assertEqual(bag.counts[ord('o') - ORD_A], 2)
+        self.assertEqual(bag.counts[ord('z') - ORD_A], 0)
+        self.assertEqual(str(bag), "Hello, World!")
+
+    def test_exact_fit(self):
+        self.assertTrue(fits(pack("listen"), pack("silent")))
+        self.assertEqual(pack("Listen!"), LetterBag("silent").packed)
+        self.assertTrue(LetterBag("listen").contains(LetterBag("Silent")))
+        self.assertEqual(len(LetterBag("listen").take(LetterBag("silent"))), 0)
+        self.assertTrue(LetterBag("zzz").contains(LetterBag("zzz")))
+
+    def test_borrow(self):
+        # A letter with count 0 must not borrow from its neighbors
+        self.assertFalse(fits(pack("ac"), pack("b")))
+        self.assertFalse(fits(pack("b"), pack("ab")))
+        self.assertFalse(fits(pack("aaz"), pack("yy")))
+        self.assertFalse(LetterBag("ac").contains(LetterBag("b")))
+        self.assertFalse(LetterBag("b").contains(LetterBag("ab")))
+        self.assertFalse(LetterBag("aaz").contains(LetterBag("y")))
+        self.assertFalse(LetterBag("y").contains(LetterBag("z")))
+
+    def test_take(self):
+        bag = LetterBag("banana")
+        rest = bag.take(LetterBag("nab"))
+        self.assertEqual(list(rest.counts), list(LetterBag("ana").counts))
+        self.assertEqual(len(rest), 3)
+        self.assertEqual(len(bag), 6)  # Unchanged
+        self.assertFalse(rest.contains(LetterBag("nab")))
+
+    def test_longer(self):
+        self.assertFalse(LetterBag("ab").contains(LetterBag("abc")))
+        # Only letters count toward the length
+        self.assertTrue(LetterBag("a b").contains(LetterBag("b-a!")))
+
+    def test_copy(self):
+        bag = LetterBag("Hello")
+        copy = bag.copy()
+        self.assertEqual((copy.word, copy.packed, len(copy)),
+                         (bag.word, bag.packed, len(bag)))
+        self.assertFalse(hasattr(copy, "__dict__"))
+
+    def test_normalize(self):
+        self.assertEqual(normalize("Don't stop!"), "dontstop")
+        self.assertEqual(normalize("Don’t—stop"), "dontstop")
+        self.assertEqual(normalize("--"), "")
+
+    def test_max_count(self):
+        self.assertEqual(len(LetterBag("a" * MAX_COUNT)), MAX_COUNT)
+        with self.assertRaises(ValueError):
+            pack("a" * (MAX_COUNT + 1))
+        with self.assertRaises(ValueError):
+            LetterBag("q" * (MAX_COUNT + 1))
+
+    def test_other_letters(self):
+        # Letters a LetterBag can't count must not be dropped quietly
+        for word in ["résumé", "naïve", "Æsop"]:
+            self.assertFalse(countable(word))
+            with self.assertRaises(ValueError):
+                pack(word)
+            with self.assertRaises(ValueError):
+                LetterBag(word)
+        # ... but other characters are skipped, ascii or not
+        self.assertTrue(countable("don’t"))
+        self.assertEqual(pack("don’t"), pack("dont"))
+
+
+class TestWordList(unittest.TestCase):
+    """Reading and thinning out the word list"""
+
+    def test_read_word_list(self):
+        f = io.StringIO("cat\n\n   \n  dog  \nB\nx\nSH\na\nI\ncat\n")
+        self.assertEqual(anagram.read_word_list(f),
+                         ["cat", "dog", "a", "I", "cat"])
+
+    def test_distinct_words(self):
+        words = ["cat", "Cat", "act", "c.a.t.", "--", "résumé", "resume", "can't", "cant"]
+        self.assertEqual(anagram.distinct_words(words),
+                         ["cat", "act", "resume", "can't"])
+
+
+class TestSearch(unittest.TestCase):
+    """The search finds what a plain exhaustive search would"""
+
+    # "ab cd gh" and "ac bd gh" leave the same letters at the
+    # same position, so the second is answered from the memo.
+    WORDS = ["ab", "cd", "ac", "bd", "gh", "ef", "e", "f", "abcd", "efgh"]
+
+    def test_brute_force(self):
+        found = search_words("abcdefgh", self.WORDS)
+        self.assertEqual(found, brute_force(LetterBag("abcdefgh"), self.WORDS))
+        self.assertIn("ac bd gh ef", found)
+        self.assertIn("ac bd gh e f", found)
+
+    def test_narrowing(self):
+        # The pool passed down must still hold every later word
+        # that fits the letters left, repeated letters included
+        words = ["ab", "aab", "ba", "bb", "a", "b", "abb", "ab"]
+        self.assertEqual(search_words("aabb", words),
+                         brute_force(LetterBag("aabb"), words))
+
+    def test_memo_cap(self):
+        # Sets of letters with too many completions are searched again,
+        # and so is everything once the memo is full
+        expect = brute_force(LetterBag("abcdefgh"), self.WORDS)
+        saved = config.MEMO_MAX_COMPLETIONS, config.MEMO_MAX_ENTRIES
+        try:
+            for cap in [0, 1, 2, 200]:
+                for entries in [0, 1, 5, 100_000]:
+                    config.MEMO_MAX_COMPLETIONS = cap
+                    config.MEMO_MAX_ENTRIES = entries
+                    self.assertEqual(search_words("abcdefgh", self.WORDS), expect)
+        finally:
+            config.MEMO_MAX_COMPLETIONS, config.MEMO_MAX_ENTRIES = saved
+
+    def test_limit(self):
+        # A limited search finds the same first anagrams as an unlimited one
+        full = search_words("abcdefgh", self.WORDS)
+        for limit in range(len(full)):
+            found = search_words("abcdefgh", self.WORDS, limit=limit)
+            self.assertGreater(len(found), limit)
+            self.assertEqual(found[:limit + 1], full[:limit + 1])
+
+    def test_seed(self):
+        found = search_words("abcdefgh", self.WORDS, seed="ab")
+        self.assertEqual(found, ["ab " + anagram
+                                 for anagram in brute_force(LetterBag("cdefgh"), self.WORDS)])
+
+
+class TestCommandLine(unittest.TestCase):
+    """Checking the command line arguments"""
+
+    def test_other_letters(self):
+        # A phrase or seed with letters we can't count is reported
+        # as a usage error rather than a crash
+        for argv in [["café"], ["cafe", "--seed", "café"]]:
+            with mock.patch.object(sys, "argv", ["anagram.py"] + argv), \
+                 contextlib.redirect_stderr(io.StringIO()) as err:
+                with self.assertRaises(SystemExit):
+                    anagram.cli()
+            self.assertIn("letters other than a-z", err.getvalue())
+        with mock.patch.object(sys, "argv", ["anagram.py", "cafe", "--seed", "face"]):
+            self.assertEqual(anagram.cli().seed, "face")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -24,6 +24,10 @@ for value,letters in POINTS_TO_LETTERS.items():
     for letter in letters:
         LETTERS_TO_POINTS[letter] = value
 
+# Translation table from each byte to its points, zero for anything
+# that is not a lower case letter, so score can convert a whole word
+# to points and add them up without testing each character in Python.
+_POINTS_BY_BYTE = bytes(LETTERS_TO_POINTS.get(chr(b), 0) for b in range(256))
 
 
 def score(word: str) -> int:
@@ -32,10 +36,9 @@ def score(word: str) -> int:
     for the normalized_word.  It is just the sum of the scores of the
     individual letters.
     """
-    sum = 0
-    for letter in word.lower():   # Converts "17 Crows"
-        if letter.islower():      # Ignores non-letters, we score "crows"
-            sum += LETTERS_TO_POINTS[letter]
-    return sum
+    # "17 Crows" scores as "crows": digits, blanks, and anything
+    # outside a-z are worth 0
+    chars = word.encode("ascii", "ignore").lower()
+    return sum(chars.translate(_POINTS_BY_BYTE))
 
 
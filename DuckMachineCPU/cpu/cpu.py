@@ -8,13 +8,21 @@ sys.path.insert(0, os.path.abspath(os.path.join(this_folder, "..")))
 #import context  #  Python import search from project root
 from instruction_set.instr_format import Instruction, OpCode, CondFlag, decode
 from cpu.memory import Memory
-from cpu.register import Register, ZeroRegister
 from cpu.mvc import MVCEvent, MVCListenable
+import operator
 import logging
 logging.basicConfig()
 log = logging.getLogger(__name__)
 log.setLevel(logging.INFO)
 
+# When not single stepping, run executes this many steps per
+# call to step_many
+STEPS_PER_CALL = 1024
+
+# Condition flag for the sign of an ALU result, looked up by
+# (result > 0) - (result < 0), which is -1, 0, or 1
+_FLAG_BY_SIGN = {-1: CondFlag.M, 0: CondFlag.Z, 1: CondFlag.P}
+
 class ALU(object):
     """The arithmetic logic unit (also called a "functional unit"
     in a modern CPU) executes a selected function but does not
@@ -27,30 +35,34 @@ class ALU(object):
     # in hardware we would use a multiplexer circuit to connect the
     # inputs and output to the selected circuitry for each operation.
     ALU_OPS = {
-        OpCode.ADD: lambda x, y: x + y,
-        OpCode.SUB: lambda x, y: x - y,
-        OpCode.MUL: lambda x, y: x * y,
-        OpCode.DIV: lambda x, y: x // y,
+        OpCode.ADD: operator.add,
+        OpCode.SUB: operator.sub,
+        OpCode.MUL: operator.mul,
+        OpCode.DIV: operator.floordiv,
         # For memory access operations load, store, the ALU
         # performs the address calculation
-        OpCode.LOAD: lambda x, y: x + y,
-        OpCode.STORE: lambda x, y: x + y,
+        OpCode.LOAD: operator.add,
+        OpCode.STORE: operator.add,
         # Some operations perform no operation
         OpCode.HALT: lambda x, y: 0
     }
 
+    def __init__(self):
+        # exec runs on every CPU step, so rather than hash the OpCode
+        # into ALU_OPS each time, we index a flat list by op code number.
+        self._ops = [None] * (max(op.value for op in OpCode) + 1)
+        for op, fn in self.ALU_OPS.items():
+            self._ops[op.value] = fn
+
     def exec(self, op: OpCode, in1: int, in2: int) -> tuple[int, CondFlag]:
-        try:
-            sol = self.ALU_OPS[op](in1, in2)
-            if sol == 0:
-                flag = CondFlag.Z
-            elif sol < 0:
-                flag = CondFlag.M
-            else:
-                flag = CondFlag.P
-            return sol, flag
-        except:
+        if in2 == 0 and op is OpCode.DIV:
+            # Division by zero is the one arithmetic error we model
+            # (integers do not overflow in Python)
             return 0, CondFlag.V
+        # op._value_ is the plain attribute behind the (much slower)
+        # op.value property
+        sol = self._ops[op._value_](in1, in2)
+        return sol, _FLAG_BY_SIGN[(sol > 0) - (sol < 0)]
 
 class CPUStep(MVCEvent):
     """CPU is beginning step with PC at a given address"""
@@ -74,66 +86,106 @@ class CPU(MVCListenable):
     def __init__(self, memory: Memory):
         super().__init__()
         self.memory = memory  # Not part of CPU; what we really have is a connection
-        self.registers = [ ZeroRegister(), Register(), Register(), Register(),
-                    Register(), Register(), Register(), Register(),
-                    Register(), Register(), Register(), Register(),
-                    Register(), Register(), Register(), Register() ]
+        # Register values are plain ints in a list, rather than Register
+        # objects, so reading or writing one is a single list access.
+        # r0 must always hold zero, so after writing to a register
+        # we zero r0 again in case it was the target.
+        self.registers = 16 * [ 0 ]
         self.condition = CondFlag.ALWAYS
         self.halted = False
         self.alu = ALU()
+        # Decoded instructions, keyed by instruction word.  Programs
+        # execute the same few words over and over (e.g., in loops),
+        # so we decode each distinct word only once.  Since the key is
+        # the word itself, not its address, a STORE that overwrites code
+        # just produces a new key; nothing needs to be invalidated.
+        self._decode_cache: dict[int, Instruction] = {}
 
     def step(self):
         """One fetch/decode/execute step"""
-        # Fetch
-        instr_word = self.registers[15].get()
-        instr_addr = self.memory.get(instr_word)
-
-        # Decode
-        instr = decode(instr_addr)
-
-        # Display the CPU state when we have decoded the instruction,
-        # before we have executed it
-        self.notify_all(CPUStep(self, instr_addr, instr_word, instr))
-
-        # Execute
-        result = self.condition & instr.cond
-        if result:
-            l_operand = self.registers[instr.reg_src1].get()
-            r_operand = self.registers[instr.reg_src2].get() + instr.offset
-            result, new_cond = self.alu.exec(instr.op, l_operand, r_operand)
-            self.condition = new_cond
-
-            if new_cond == CondFlag.V:
-                self.halted = True
+        self.step_many(1)
+
+    def step_many(self, n: int) -> int:
+        """Up to n fetch/decode/execute steps, stopping early
+        after a step that halts the CPU.  Returns the number of
+        steps taken.  Running many steps in one call lets us fetch
+        the CPU's parts into local variables once, rather than
+        looking them up again on every step.
+        """
+        registers = self.registers
+        mem_get = self.memory.get
+        mem_put = self.memory.put
+        alu_exec = self.alu.exec
+        decode_cache = self._decode_cache
+        listeners = self.listeners
+        notify_all = self.notify_all
+        HALT, LOAD, STORE = OpCode.HALT, OpCode.LOAD, OpCode.STORE
+        V = CondFlag.V
 
-            counter = self.registers[15].get() + 1
-            self.registers[15].put(counter)
+        condition = self.condition
+        halted = False
+        steps = 0
+        try:
+            while steps < n and not halted:
+                steps += 1
+                # Fetch
+                instr_word = registers[15]
+                instr_addr = mem_get(instr_word)
+
+                # Decode
+                instr = decode_cache.get(instr_addr)
+                if instr is None:
+                    instr = decode(instr_addr)
+                    decode_cache[instr_addr] = instr
+
+                # Display the CPU state when we have decoded the instruction,
+                # before we have executed it.  Usually nothing is listening,
+                # and then we need not even create the event.
+                if listeners:
+                    notify_all(CPUStep(self, instr_addr, instr_word, instr))
+
+                # Execute, if the condition flags match the predicate.
+                # (Compare the underlying ints: & on the flags themselves
+                # builds a new CondFlag each time.)
+                if not condition._value_ & instr.cond._value_:
+                    registers[15] = instr_word + 1
+                    continue
+                l_operand = registers[instr.reg_src1]
+                r_operand = registers[instr.reg_src2] + instr.offset
+                result, condition = alu_exec(instr.op, l_operand, r_operand)
+                if condition is V:
+                    halted = True
 
-            if instr.op == OpCode.HALT:
+                registers[15] = instr_word + 1
+
+                op = instr.op
+                if op is HALT:
+                    halted = True
+                elif op is LOAD:
+                    registers[instr.reg_target] = mem_get(result)
+                    registers[0] = 0
+                elif op is STORE:
+                    mem_put(result, registers[instr.reg_target])
+                else:
+                    registers[instr.reg_target] = result
+                    registers[0] = 0
+        finally:
+            # Write back state kept in locals, even if a step
+            # raised an exception (e.g., a SegFault)
+            self.condition = condition
+            if halted:
                 self.halted = True
-            elif instr.op == OpCode.LOAD:
-                val = instr.reg_target
-                fetch_val = self.memory.get(result)
-                self.registers[val].put(fetch_val)
-            elif instr.op == OpCode.STORE:
-                val = instr.reg_target
-                fetch_val = self.registers[val].get()
-                self.memory.put(result,fetch_val)
-            else:
-                val = instr.reg_target
-                self.registers[val].put(result) 
-        else:
-            counter = self.registers[15].get() + 1
-            self.registers[15].put(counter)
-        return
+        return steps
 
     def run(self, from_addr=0,  single_step=False) -> None:
         """Step th CPU until it executes a HALT"""
         self.halted = False
-        self.registers[15].put(from_addr)
+        self.registers[15] = from_addr
         step_count = 0
         while not self.halted:
             if single_step:
                 input(f"Step {step_count}; press enter")
-            self.step()
-            step_count += 1
\ No newline at end of file
+                self.step()
+                step_count += 1
+            else:
+                step_count += self.step_many(STEPS_PER_CALL)
\ No newline at end of file
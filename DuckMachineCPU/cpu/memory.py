@@ -60,7 +60,8 @@ class Memory(MVCListenable):
         """Fetch a word from memory"""
         log.debug("Fetching word at memory address {}".format(index))
         self._check_bounds(index)
-        self.notify_all(MemoryRead(self,index,self._mem[index]))
+        if self.listeners:
+            self.notify_all(MemoryRead(self,index,self._mem[index]))
         return self._mem[index]
 
     def put(self, index: int, value: int) -> None:
@@ -70,7 +71,8 @@ class Memory(MVCListenable):
         self._check_bounds(index)
         log.debug("Storing value {} at memory address {}".format(value, index))
         self._mem[index] = value
-        self.notify_all(MemoryWrite(self,index,value))
+        if self.listeners:
+            self.notify_all(MemoryWrite(self,index,value))
 
 
 class MemoryMappedIO(Memory):
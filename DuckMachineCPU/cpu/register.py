@@ -1,6 +1,11 @@
 """
 A Duck Machine register holds a 32 bit integer. 
 The Zero register is special: It always holds 0. 
+
+Note: the CPU in cpu.py no longer uses these classes.  It keeps
+plain ints in CPU.registers, and step_many puts r0 back to 0 after
+each register write.  They are kept because docs/HOWTO-cpu.md
+builds the CPU from them.
 """
 
 
@@ -147,7 +147,7 @@ class MachineStateView(object):
         self.instr_decoded.setText(str(event.instr))
         for reg_index in range(16):
             # Index both the display and the model registers
-            reg_value = self.model.registers[reg_index].get()
+            reg_value = self.model.registers[reg_index]
             reg_display = self.registers[reg_index]
             reg_display.label.setText(str(reg_value))
 
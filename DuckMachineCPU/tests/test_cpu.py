@@ -1,5 +1,6 @@
 import context
 from cpu.cpu import *
+from cpu.memory import Memory
 import unittest
 
 class TestALU(unittest.TestCase):
@@ -32,5 +33,50 @@ class TestALU(unittest.TestCase):
         self.assertEqual(alu.exec(OpCode.STORE, 27, 13), (40, CondFlag.P))
         self.assertEqual(alu.exec(OpCode.HALT, 99, 98), (0, CondFlag.Z))
 
+class TestCPU(unittest.TestCase):
+    """Run small programs on the CPU"""
+
+    def load(self, words: list[int]) -> CPU:
+        memory = Memory(32)
+        for addr, word in enumerate(words):
+            memory.put(addr, word)
+        return CPU(memory)
+
+    def test_overwritten_instruction(self):
+        """A program that stores over one of its own instructions
+        must execute the new instruction, not a stale decoding.
+        """
+        ALWAYS = CondFlag.ALWAYS
+        cpu = self.load([
+            Instruction(OpCode.ADD, ALWAYS, 2, 2, 0, 1).encode(),     # r2 += 1 (rewritten)
+            Instruction(OpCode.SUB, ALWAYS, 0, 3, 0, 0).encode(),     # test r3
+            Instruction(OpCode.HALT, CondFlag.P, 0, 0, 0, 0).encode(),
+            Instruction(OpCode.ADD, ALWAYS, 3, 0, 0, 1).encode(),     # r3 = 1
+            Instruction(OpCode.LOAD, ALWAYS, 1, 0, 0, 7).encode(),    # r1 = mem[7]
+            Instruction(OpCode.STORE, ALWAYS, 1, 0, 0, 0).encode(),   # mem[0] = r1
+            Instruction(OpCode.ADD, ALWAYS, 15, 0, 0, 0).encode(),    # pc = 0
+            Instruction(OpCode.ADD, ALWAYS, 2, 2, 0, 10).encode(),    # r2 += 10
+        ])
+        cpu.run()
+        self.assertTrue(cpu.halted)
+        self.assertEqual(cpu.registers[2], 11)
+
+    def test_zero_register(self):
+        """Writes to r0 are discarded, whether from the ALU or memory"""
+        ALWAYS = CondFlag.ALWAYS
+        cpu = self.load([
+            Instruction(OpCode.ADD, ALWAYS, 0, 0, 0, 5).encode(),     # r0 = 5
+            Instruction(OpCode.ADD, ALWAYS, 1, 0, 0, 1).encode(),     # r1 = r0 + 1
+            Instruction(OpCode.LOAD, ALWAYS, 0, 0, 0, 5).encode(),    # r0 = mem[5]
+            Instruction(OpCode.ADD, ALWAYS, 2, 0, 0, 1).encode(),     # r2 = r0 + 1
+            Instruction(OpCode.HALT, ALWAYS, 0, 0, 0, 0).encode(),
+            42
+        ])
+        cpu.run()
+        self.assertEqual(cpu.registers[0], 0)
+        self.assertEqual(cpu.registers[1], 1)
+        self.assertEqual(cpu.registers[2], 1)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file